@@ -1,10 +1,14 @@
 import sys
 import os
+import re
+import mmap
 import time
+import queue
 import threading
-import tempfile
+import multiprocessing
 from pathlib import Path
 from functools import partial
+from concurrent.futures import ProcessPoolExecutor
 
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
@@ -14,102 +18,177 @@ from PyQt6.QtWidgets import (
     QListWidget, QListWidgetItem, QFrame, QScrollArea, QToolBar,
     QStatusBar, QFontComboBox, QDoubleSpinBox
 )
-from PyQt6.QtCore import Qt, QUrl, QTimer, pyqtSignal, QThread, QSize
+from PyQt6.QtCore import (
+    Qt, QUrl, QTimer, pyqtSignal, QSize, QRunnable, QThreadPool,
+    QSignalBlocker, QObject, QBuffer, QByteArray, QIODevice
+)
 from PyQt6.QtGui import QIcon, QFont, QColor, QPixmap, QImage, QAction
 from PyQt6.QtMultimedia import QMediaPlayer, QAudioOutput
 from PyQt6.QtMultimediaWidgets import QVideoWidget
 
+import numpy as np
+
 import main as subtitling_backend
 
-class SubtitleWorker(QThread):
-    progress_update = pyqtSignal(str, int)
-    finished = pyqtSignal(bool, str)
-    subtitles_extracted = pyqtSignal(list)
+_PREVIEW_LEN = 40
+_ELLIPSIS = "…"
+_TAG_RE = re.compile(r"\{\\[^}]*\}")
+_BUFFERED_VIDEO_MAX = 256 << 20
+
+def _format_times_bulk(seconds_arr):
+    if not len(seconds_arr):
+        return np.empty(0, dtype=str)
+    total_cs = (seconds_arr * 100).astype(np.int64)
+    mins, rem = np.divmod(total_cs, 6000)
+    secs, cs = np.divmod(rem, 100)
+    formatted = np.char.add(np.char.zfill(mins.astype(str), 2), ":")
+    formatted = np.char.add(formatted, np.char.zfill(secs.astype(str), 2))
+    formatted = np.char.add(formatted, ".")
+    return np.char.add(formatted, np.char.zfill(cs.astype(str), 2))
+
+def _srt_timestamps(seconds_arr):
+    ms_total = (seconds_arr * 1000).astype(np.int64)
+    hours, rem = np.divmod(ms_total, 3_600_000)
+    minutes, rem = np.divmod(rem, 60_000)
+    secs, millisecs = np.divmod(rem, 1000)
+    return ["%02d:%02d:%02d,%03d" % t for t in zip(
+        hours.tolist(), minutes.tolist(), secs.tolist(), millisecs.tolist())]
+
+def _write_srt(file_path, subtitles):
+    count = len(subtitles)
+    starts = _srt_timestamps(np.fromiter(
+        (s["start_time"] for s in subtitles), dtype=np.float64, count=count))
+    ends = _srt_timestamps(np.fromiter(
+        (s["end_time"] for s in subtitles), dtype=np.float64, count=count))
+    
+    lines = [
+        "%d\n%s --> %s\n%s\n" % (i, start, end, s["text"])
+        for i, (s, start, end) in enumerate(zip(subtitles, starts, ends), 1)
+    ]
+    
+    data = ("\n".join(lines) + "\n").encode('utf-8')
+    
+    with open(file_path, 'wb') as f:
+        f.write(data)
+
+def _extract_worker(args):
+    input_path, model_path = args
+    return subtitling_backend.transcribe_video(input_path, model_path)
+
+class SubtitleRunnable(QRunnable):
+    class Signals(QObject):
+        progress_update = pyqtSignal(str, int)
+        finished = pyqtSignal(bool, str)
+        # The emitted list is handed off to the receiver; the worker keeps no reference to it.
+        subtitles_extracted = pyqtSignal(list)
     
     def __init__(self, input_path, output_path, model_path, subtitle_settings):
         super().__init__()
+        self.signals = self.Signals()
         self.input_path = input_path
         self.output_path = output_path
         self.model_path = model_path
         self.subtitle_settings = subtitle_settings
-        self.temp_files = []
         
     def run(self):
         try:
-            self.progress_update.emit("Extracting audio...", 10)
-            
-            audio_path = subtitling_backend.extract_audio(self.input_path)
-            self.temp_files.append(audio_path)
-            
-            if not audio_path:
-                self.finished.emit(False, "Failed to extract audio")
-                return
-            
-            self.progress_update.emit("Transcribing audio...", 30)
-            
-            subtitles = subtitling_backend.transcribe_audio(audio_path, self.model_path)
+            subtitles = self._transcribe_pipelined()
             
             if not subtitles:
-                self.finished.emit(False, "No speech detected or transcription failed")
+                self.signals.finished.emit(False, "No speech detected or transcription failed")
                 return
             
             self._apply_subtitle_settings(subtitles)
             
-            self.subtitles_extracted.emit(subtitles)
+            self.signals.subtitles_extracted.emit(subtitles)
             
-            self.progress_update.emit("Cleaning up...", 95)
-            self._cleanup()
-            self.finished.emit(True, "Subtitling completed successfully")
+            self.signals.finished.emit(True, "Subtitling completed successfully")
             
         except Exception as e:
-            self._cleanup()
-            self.finished.emit(False, f"An error occurred: {str(e)}")
-    
-    def _apply_subtitle_settings(self, subtitles):
-        pass
+            self.signals.finished.emit(False, f"An error occurred: {str(e)}")
     
-    def _cleanup(self):
-        for file_path in self.temp_files:
-            if file_path and os.path.exists(file_path):
+    def _transcribe_pipelined(self):
+        self.signals.progress_update.emit("Extracting and transcribing audio...", 10)
+        
+        audio_queue = queue.Queue(maxsize=4)
+        stop_event = threading.Event()
+        total_bytes = subtitling_backend.get_audio_byte_count(self.input_path)
+        chunk_bytes = subtitling_backend.TRANSCRIBE_CHUNK_SECONDS * subtitling_backend.AUDIO_SAMPLE_RATE * 2
+        total_chunks = max(1, -(-total_bytes // chunk_bytes))
+        
+        def on_chunk(chunks_done):
+            total = max(total_chunks, chunks_done)
+            self.signals.progress_update.emit(
+                f"Transcribing {chunks_done}/{total}", 30 + 60 * chunks_done // total)
+        
+        producer = threading.Thread(
+            target=subtitling_backend.stream_audio,
+            args=(self.input_path, audio_queue),
+            kwargs={"stop_event": stop_event},
+            daemon=True)
+        producer.start()
+        
+        try:
+            return subtitling_backend.transcribe_audio_stream(
+                audio_queue, self.model_path, on_chunk)
+        except BaseException:
+            # The consumer may already have taken the None sentinel, so drain
+            # only until the producer has exited rather than until None.
+            stop_event.set()
+            while producer.is_alive():
                 try:
-                    os.remove(file_path)
-                except:
+                    audio_queue.get(timeout=0.1)
+                except queue.Empty:
                     pass
+            raise
+    
+    def _apply_subtitle_settings(self, subtitles):
+        pass
 
-class VideoGenerationWorker(QThread):
-    progress_update = pyqtSignal(str, int)
-    finished = pyqtSignal(bool, str, str)
+class VideoGenerationRunnable(QRunnable):
+    class Signals(QObject):
+        progress_update = pyqtSignal(str, int)
+        finished = pyqtSignal(bool, str, str)
     
-    def __init__(self, input_path, output_path, subtitles, style_settings):
+    def __init__(self, input_path, output_path, subtitles, style_settings, low_latency=False):
         super().__init__()
+        self.signals = self.Signals()
         self.input_path = input_path
         self.output_path = output_path
         self.subtitles = subtitles
         self.style_settings = style_settings
+        self.low_latency = low_latency
         
     def run(self):
         try:
-            self.progress_update.emit("Adding subtitles to video...", 30)
+            self.signals.progress_update.emit("Adding subtitles to video...", 30)
             
             output_video = subtitling_backend.create_subtitled_video(
-                self.input_path, self.subtitles, self.output_path)
+                self.input_path, self.subtitles, self.output_path,
+                low_latency=self.low_latency)
             
             if not output_video:
-                self.finished.emit(False, "Failed to create output video", "")
+                self.signals.finished.emit(False, "Failed to create output video", "")
                 return
             
-            self.progress_update.emit("Video generation complete", 100)
-            self.finished.emit(True, "Video created successfully", self.output_path)
+            self.signals.progress_update.emit("Video generation complete", 100)
+            self.signals.finished.emit(True, "Video created successfully", self.output_path)
             
         except Exception as e:
-            self.finished.emit(False, f"An error occurred: {str(e)}", "")
+            self.signals.finished.emit(False, f"An error occurred: {str(e)}", "")
 
 class SubtitleEditor(QWidget):
     subtitle_updated = pyqtSignal()
     
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.subtitles = []
+        self._starts = np.empty(0, dtype=np.float64)
+        self._ends = np.empty(0, dtype=np.float64)
+        self._texts = []
+        self._words = []
+        self._source = []
+        self._dirty = False
+        self._item_cache = []
         self.current_index = -1
         self.init_ui()
     
@@ -117,6 +196,7 @@ class SubtitleEditor(QWidget):
         layout = QVBoxLayout()
         
         self.subtitle_list = QListWidget()
+        self.subtitle_list.setUniformItemSizes(True)
         self.subtitle_list.currentRowChanged.connect(self.select_subtitle)
         layout.addWidget(QLabel("Subtitles:"))
         layout.addWidget(self.subtitle_list)
@@ -173,34 +253,53 @@ class SubtitleEditor(QWidget):
         self.delete_btn.setEnabled(False)
     
     def load_subtitles(self, subtitles):
-        self.subtitles = subtitles.copy() if subtitles else []
+        subtitles = subtitles or []
+        count = len(subtitles)
+        self._starts = np.fromiter(
+            (s["start_time"] for s in subtitles), dtype=np.float64, count=count)
+        self._ends = np.fromiter(
+            (s["end_time"] for s in subtitles), dtype=np.float64, count=count)
+        self._texts = [s["text"] for s in subtitles]
+        self._words = [s.get("words", []) for s in subtitles]
+        self._source = subtitles
+        self._dirty = False
         self.refresh_subtitle_list()
-        if self.subtitles:
+        if self._texts:
             self.subtitle_list.setCurrentRow(0)
             self.update_btn.setEnabled(True)
             self.delete_btn.setEnabled(True)
     
     def refresh_subtitle_list(self):
         current_row = self.subtitle_list.currentRow()
-        self.subtitle_list.clear()
-        for subtitle in self.subtitles:
-            start = subtitle["start_time"]
-            end = subtitle["end_time"]
-            text = subtitle["text"]
-            text_preview = text[:40] + ("..." if len(text) > 40 else "")
-            display_text = f"{self._format_time(start)} - {self._format_time(end)}: {text_preview}"
-            self.subtitle_list.addItem(display_text)
+        starts = _format_times_bulk(self._starts)
+        ends = _format_times_bulk(self._ends)
+        display_texts = [
+            self._display_text(start_str, end_str, text)
+            for start_str, end_str, text in zip(starts, ends, self._texts)
+        ]
+        
+        self.subtitle_list.setUpdatesEnabled(False)
+        self.subtitle_list.blockSignals(True)
+        try:
+            self.subtitle_list.clear()
+            self.subtitle_list.addItems(display_texts)
+            self._item_cache = [self.subtitle_list.item(i) for i in range(len(display_texts))]
+        finally:
+            self.subtitle_list.blockSignals(False)
+            self.subtitle_list.setUpdatesEnabled(True)
         
         if current_row >= 0 and current_row < self.subtitle_list.count():
             self.subtitle_list.setCurrentRow(current_row)
         elif self.subtitle_list.count() > 0:
             self.subtitle_list.setCurrentRow(0)
+        else:
+            self.select_subtitle(-1)
     
     def select_subtitle(self, index):
         self.update_btn.setEnabled(index >= 0)
         self.delete_btn.setEnabled(index >= 0)
         
-        if index < 0 or index >= len(self.subtitles):
+        if index < 0 or index >= len(self._texts):
             self.current_index = -1
             self.text_edit.clear()
             self.start_time.setValue(0)
@@ -208,22 +307,15 @@ class SubtitleEditor(QWidget):
             return
         
         self.current_index = index
-        subtitle = self.subtitles[index]
-        
-        self.text_edit.blockSignals(True)
-        self.start_time.blockSignals(True)
-        self.end_time.blockSignals(True)
         
-        self.text_edit.setText(subtitle["text"])
-        self.start_time.setValue(subtitle["start_time"])
-        self.end_time.setValue(subtitle["end_time"])
-        
-        self.text_edit.blockSignals(False)
-        self.start_time.blockSignals(False)
-        self.end_time.blockSignals(False)
+        with QSignalBlocker(self.text_edit), QSignalBlocker(self.start_time), \
+                QSignalBlocker(self.end_time):
+            self.text_edit.setText(self._texts[index])
+            self.start_time.setValue(float(self._starts[index]))
+            self.end_time.setValue(float(self._ends[index]))
     
     def update_subtitle(self):
-        if self.current_index < 0 or self.current_index >= len(self.subtitles):
+        if self.current_index < 0 or self.current_index >= len(self._texts):
             return
         
         new_text = self.text_edit.toPlainText()
@@ -235,15 +327,23 @@ class SubtitleEditor(QWidget):
                                 "Start time must be less than end time.")
             return
         
-        self.subtitles[self.current_index]["text"] = new_text
-        self.subtitles[self.current_index]["start_time"] = new_start
-        self.subtitles[self.current_index]["end_time"] = new_end
+        index = self.current_index
+        self._texts[index] = new_text
+        self._starts[index] = new_start
+        self._ends[index] = new_end
         
-        self.refresh_subtitle_list()
+        new_index = self._sort_cues(index)
+        if new_index == index:
+            self._item_cache[index].setText(self._display_text(
+                self._format_time(new_start), self._format_time(new_end), new_text))
+        else:
+            self.refresh_subtitle_list()
+            self.subtitle_list.setCurrentRow(new_index)
+        self._dirty = True
         self.subtitle_updated.emit()
     
     def delete_subtitle(self):
-        if self.current_index < 0 or self.current_index >= len(self.subtitles):
+        if self.current_index < 0 or self.current_index >= len(self._texts):
             return
         
         reply = QMessageBox.question(
@@ -253,39 +353,100 @@ class SubtitleEditor(QWidget):
         )
         
         if reply == QMessageBox.StandardButton.Yes:
-            del self.subtitles[self.current_index]
-            self.refresh_subtitle_list()
+            index = self.current_index
+            self._starts = np.delete(self._starts, index)
+            self._ends = np.delete(self._ends, index)
+            del self._texts[index]
+            del self._words[index]
+            del self._item_cache[index]
+            self.subtitle_list.takeItem(index)
+            self.select_subtitle(self.subtitle_list.currentRow())
+            self._dirty = True
             self.subtitle_updated.emit()
     
     def add_new_subtitle(self):
         last_time = 0
-        if self.subtitles:
-            last_time = self.subtitles[-1]["end_time"]
-        
-        new_subtitle = {
-            "text": "New subtitle text",
-            "start_time": last_time + 0.5,
-            "end_time": last_time + 3.5,
-            "words": []
-        }
-        
-        self.subtitles.append(new_subtitle)
-        self.refresh_subtitle_list()
-        self.subtitle_list.setCurrentRow(len(self.subtitles) - 1)
+        if self._texts:
+            last_time = float(self._ends[-1])
+        
+        new_start = last_time + 0.5
+        new_end = last_time + 3.5
+        new_text = "New subtitle text"
+        
+        self._starts = np.append(self._starts, new_start)
+        self._ends = np.append(self._ends, new_end)
+        self._texts.append(new_text)
+        self._words.append([])
+        item = QListWidgetItem(self._display_text(
+            self._format_time(new_start), self._format_time(new_end), new_text))
+        self._item_cache.append(item)
+        self.subtitle_list.addItem(item)
+        self.subtitle_list.setCurrentRow(len(self._texts) - 1)
+        self._dirty = True
         self.subtitle_updated.emit()
     
+    def index_at(self, t_seconds):
+        i = int(np.searchsorted(self._starts, t_seconds, side='right')) - 1
+        if 0 <= i < len(self._starts) and t_seconds <= self._ends[i]:
+            return i
+        return -1
+    
+    def follow_playback(self, t_seconds):
+        if self._has_pending_edit():
+            return
+        index = self.index_at(t_seconds)
+        if index >= 0 and index != self.current_index:
+            self.subtitle_list.setCurrentRow(index)
+    
+    def _has_pending_edit(self):
+        index = self.current_index
+        if index < 0 or index >= len(self._texts):
+            return False
+        return (self.text_edit.toPlainText() != self._texts[index]
+                or abs(self.start_time.value() - self._starts[index]) >= 0.005
+                or abs(self.end_time.value() - self._ends[index]) >= 0.005)
+    
+    def _sort_cues(self, index):
+        if np.all(self._starts[:-1] <= self._starts[1:]):
+            return index
+        
+        order = np.argsort(self._starts, kind='stable')
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+        
+        self._starts = self._starts[order]
+        self._ends = self._ends[order]
+        self._texts = [self._texts[i] for i in order.tolist()]
+        self._words = [self._words[i] for i in order.tolist()]
+        return int(rank[index])
+    
     def get_subtitles(self):
-        return self.subtitles.copy()
+        if self._dirty:
+            self._source = [
+                {"text": text, "start_time": start, "end_time": end, "words": words}
+                for text, start, end, words in zip(
+                    self._texts, self._starts.tolist(), self._ends.tolist(), self._words)
+            ]
+            self._dirty = False
+        return self._source
+    
+    def _display_text(self, start_str, end_str, text):
+        clean = _TAG_RE.sub("", text)
+        text_preview = clean[:_PREVIEW_LEN] + (_ELLIPSIS if len(clean) > _PREVIEW_LEN else "")
+        return f"{start_str} - {end_str}: {text_preview}"
     
     def _format_time(self, seconds):
-        mins = int(seconds // 60)
-        secs = int(seconds % 60)
-        ms = int((seconds - int(seconds)) * 100)
-        return f"{mins:02d}:{secs:02d}.{ms:02d}"
+        mins, rem = divmod(int(seconds * 100), 6000)
+        secs, cs = divmod(rem, 100)
+        return f"{mins:02d}:{secs:02d}.{cs:02d}"
 
 class StyleSettings(QWidget):
+    _SS_SOLID = "background-color: {};"
+    _SS_RGBA = "background-color: rgba({},{},{},{});"
+    
     def __init__(self, parent=None):
         super().__init__(parent)
+        self._cached_settings = None
         self.init_ui()
     
     def init_ui(self):
@@ -323,8 +484,9 @@ class StyleSettings(QWidget):
         
         text_color_row = QHBoxLayout()
         self.text_color_btn = QPushButton("  ")
-        self.text_color_btn.setStyleSheet("background-color: white;")
         self.text_color = QColor(255, 255, 255)
+        self._text_rgb = self.text_color.getRgb()
+        self.text_color_btn.setStyleSheet(self._SS_SOLID.format(self.text_color.name()))
         self.text_color_btn.clicked.connect(self.choose_text_color)
         text_color_row.addWidget(QLabel("Text Color:"))
         text_color_row.addWidget(self.text_color_btn)
@@ -332,8 +494,9 @@ class StyleSettings(QWidget):
         
         outline_color_row = QHBoxLayout()
         self.outline_color_btn = QPushButton("  ")
-        self.outline_color_btn.setStyleSheet("background-color: black;")
         self.outline_color = QColor(0, 0, 0)
+        self._outline_rgb = self.outline_color.getRgb()
+        self.outline_color_btn.setStyleSheet(self._SS_SOLID.format(self.outline_color.name()))
         self.outline_color_btn.clicked.connect(self.choose_outline_color)
         outline_color_row.addWidget(QLabel("Outline Color:"))
         outline_color_row.addWidget(self.outline_color_btn)
@@ -341,8 +504,9 @@ class StyleSettings(QWidget):
         
         bg_color_row = QHBoxLayout()
         self.bg_color_btn = QPushButton("  ")
-        self.bg_color_btn.setStyleSheet("background-color: rgba(0, 0, 0, 150);")
         self.bg_color = QColor(0, 0, 0, 150)
+        self._bg_rgb = self.bg_color.getRgb()
+        self.bg_color_btn.setStyleSheet(self._SS_RGBA.format(*self._bg_rgb))
         self.bg_color_btn.clicked.connect(self.choose_bg_color)
         bg_color_row.addWidget(QLabel("Background:"))
         bg_color_row.addWidget(self.bg_color_btn)
@@ -375,39 +539,84 @@ class StyleSettings(QWidget):
         layout.addStretch()
         
         self.setLayout(layout)
+        
+        self.font_combo.currentFontChanged.connect(self._invalidate_cache)
+        self.font_size.valueChanged.connect(self._invalidate_cache)
+        self.bold_check.toggled.connect(self._invalidate_cache)
+        self.italic_check.toggled.connect(self._invalidate_cache)
+        self.bg_opacity.valueChanged.connect(self._invalidate_cache)
+        self.position_bottom.toggled.connect(self._invalidate_cache)
+        self.position_top.toggled.connect(self._invalidate_cache)
+    
+    def _invalidate_cache(self, *args):
+        self._cached_settings = None
     
     def choose_text_color(self):
         color = QColorDialog.getColor(self.text_color, self, "Choose Text Color")
         if color.isValid():
             self.text_color = color
-            self.text_color_btn.setStyleSheet(f"background-color: {color.name()};")
+            self._text_rgb = color.getRgb()
+            self.text_color_btn.setStyleSheet(self._SS_SOLID.format(color.name()))
+            self._invalidate_cache()
     
     def choose_outline_color(self):
         color = QColorDialog.getColor(self.outline_color, self, "Choose Outline Color")
         if color.isValid():
             self.outline_color = color
-            self.outline_color_btn.setStyleSheet(f"background-color: {color.name()};")
+            self._outline_rgb = color.getRgb()
+            self.outline_color_btn.setStyleSheet(self._SS_SOLID.format(color.name()))
+            self._invalidate_cache()
     
     def choose_bg_color(self):
         color = QColorDialog.getColor(self.bg_color, self, "Choose Background Color", options=QColorDialog.ColorDialogOption.ShowAlphaChannel)
         if color.isValid():
             self.bg_color = color
-            self.bg_color_btn.setStyleSheet(f"background-color: rgba({color.red()}, {color.green()}, {color.blue()}, {color.alpha()});")
+            self._bg_rgb = color.getRgb()
+            self.bg_color_btn.setStyleSheet(self._SS_RGBA.format(*self._bg_rgb))
+            self._invalidate_cache()
     
     def get_settings(self):
-        return {
+        if self._cached_settings is not None:
+            return self._cached_settings
+        
+        self._cached_settings = {
             "font_family": self.font_combo.currentFont().family(),
             "font_size": self.font_size.value(),
             "bold": self.bold_check.isChecked(),
             "italic": self.italic_check.isChecked(),
-            "text_color": self.text_color.getRgb(),
-            "outline_color": self.outline_color.getRgb(),
-            "bg_color": self.bg_color.getRgb(),
+            "text_color": self._text_rgb,
+            "outline_color": self._outline_rgb,
+            "bg_color": self._bg_rgb,
             "bg_opacity": self.bg_opacity.value() / 100.0,
             "position": "bottom" if self.position_bottom.isChecked() else "top"
         }
+        return self._cached_settings
+
+class _MmapDevice(QIODevice):
+    def __init__(self, mm, parent=None):
+        super().__init__(parent)
+        self._mm = mm
+    
+    def isSequential(self):
+        return False
+    
+    def size(self):
+        return len(self._mm)
+    
+    def readData(self, maxlen):
+        pos = self.pos()
+        return self._mm[pos:pos + maxlen]
+    
+    def writeData(self, data):
+        return -1
+    
+    def close(self):
+        super().close()
+        self._mm.close()
 
 class VideoPlayer(QWidget):
+    playback_time_changed = pyqtSignal(float)
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.init_ui()
@@ -441,6 +650,14 @@ class VideoPlayer(QWidget):
         
         self.setLayout(layout)
         
+        self._device = None
+        self._device_path = None
+        self._pending_pos = 0
+        self._last_label = ""
+        self._pos_timer = QTimer(self)
+        self._pos_timer.setInterval(100)
+        self._pos_timer.timeout.connect(self._flush_position)
+        
         self.media_player.playbackStateChanged.connect(self.media_state_changed)
         self.media_player.positionChanged.connect(self.position_changed)
         self.media_player.durationChanged.connect(self.duration_changed)
@@ -449,8 +666,44 @@ class VideoPlayer(QWidget):
     
     def load_video(self, file_path):
         self.media_player.setSource(QUrl.fromLocalFile(file_path))
+        self._release_device()
+        self.play_btn.setEnabled(True)
+    
+    def load_video_from_memory(self, file_path):
+        try:
+            with open(file_path, 'rb') as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # Empty files and unmappable filesystems play fine straight from disk.
+            self.load_video(file_path)
+            return
+        
+        if len(mm) <= _BUFFERED_VIDEO_MAX:
+            device = QBuffer(self)
+            device.setData(QByteArray(mm[:]))
+            mm.close()
+        else:
+            device = _MmapDevice(mm, self)
+        device.open(QIODevice.OpenModeFlag.ReadOnly)
+        
+        self.media_player.setSourceDevice(device, QUrl.fromLocalFile(file_path))
+        self._release_device()
+        self._device = device
+        self._device_path = file_path
         self.play_btn.setEnabled(True)
     
+    def release_file(self, file_path):
+        if self._device is not None and self._device_path == file_path:
+            self.media_player.setSource(QUrl())
+            self._release_device()
+    
+    def _release_device(self):
+        if self._device is not None:
+            self._device.close()
+            self._device.deleteLater()
+            self._device = None
+            self._device_path = None
+    
     def toggle_play(self):
         if self.media_player.playbackState() == QMediaPlayer.PlaybackState.PlayingState:
             self.media_player.pause()
@@ -460,12 +713,21 @@ class VideoPlayer(QWidget):
     def media_state_changed(self, state):
         if self.media_player.playbackState() == QMediaPlayer.PlaybackState.PlayingState:
             self.play_btn.setText("Pause")
+            self._pos_timer.start()
         else:
             self.play_btn.setText("Play")
+            self._pos_timer.stop()
+            self._flush_position()
     
     def position_changed(self, position):
-        self.position_slider.setValue(position)
-        self._update_time_label(position, self.media_player.duration())
+        self._pending_pos = position
+        if not self._pos_timer.isActive():
+            self._flush_position()
+    
+    def _flush_position(self):
+        self.position_slider.setValue(self._pending_pos)
+        self._update_time_label(self._pending_pos, self.media_player.duration())
+        self.playback_time_changed.emit(self._pending_pos / 1000.0)
     
     def duration_changed(self, duration):
         self.position_slider.setRange(0, duration)
@@ -477,7 +739,10 @@ class VideoPlayer(QWidget):
     def _update_time_label(self, position, duration):
         position_str = self._format_time(position)
         duration_str = self._format_time(duration)
-        self.time_label.setText(f"{position_str} / {duration_str}")
+        label = f"{position_str} / {duration_str}"
+        if label != self._last_label:
+            self._last_label = label
+            self.time_label.setText(label)
     
     def _format_time(self, ms):
         if ms <= 0:
@@ -488,15 +753,26 @@ class VideoPlayer(QWidget):
         return f"{m:02d}:{s:02d}"
 
 class MainWindow(QMainWindow):
+    batch_extracted = pyqtSignal(str, str, object, str)
+    
     def __init__(self):
         super().__init__()
         
         self.input_video_path = ""
+        self._input_p = None
         self.output_video_path = ""
         self.model_path = ""
         self.subtitles = []
+        self._subtitles_stale = False
+        
+        self.pool = QThreadPool.globalInstance()
+        self.pool.setMaxThreadCount(max(2, (os.cpu_count() or 2) // 2))
+        self._active_jobs = set()
+        self._batch_executor = None
+        self._batch_pending = 0
         
         self.init_ui()
+        self.batch_extracted.connect(self.batch_item_finished)
         self.setWindowTitle("Video Subtitler")
         self.resize(1200, 800)
     
@@ -544,6 +820,7 @@ class MainWindow(QMainWindow):
         
         self.subtitle_editor = SubtitleEditor()
         self.subtitle_editor.subtitle_updated.connect(self.on_subtitle_updated)
+        self.video_player.playback_time_changed.connect(self.subtitle_editor.follow_playback)
         self.tabs.addTab(self.subtitle_editor, "Subtitle Editor")
         
         self.style_settings = StyleSettings()
@@ -613,14 +890,24 @@ class MainWindow(QMainWindow):
         
         subtitle_menu = menu_bar.addMenu("Subtitles")
         
-        extract_action = QAction("Extract from Video", self)
-        extract_action.triggered.connect(self.extract_subtitles)
-        subtitle_menu.addAction(extract_action)
+        self.extract_action = QAction("Extract from Video", self)
+        self.extract_action.triggered.connect(self.extract_subtitles)
+        subtitle_menu.addAction(self.extract_action)
         
         export_srt_action = QAction("Export SRT", self)
         export_srt_action.triggered.connect(self.export_srt)
         subtitle_menu.addAction(export_srt_action)
         
+        batch_action = QAction("Batch Export SRT...", self)
+        batch_action.triggered.connect(self.batch_export_srt)
+        subtitle_menu.addAction(batch_action)
+        
+        subtitle_menu.addSeparator()
+        
+        unload_model_action = QAction("Unload Model", self)
+        unload_model_action.triggered.connect(self.unload_model)
+        subtitle_menu.addAction(unload_model_action)
+        
         help_menu = menu_bar.addMenu("Help")
         
         about_action = QAction("About", self)
@@ -632,23 +919,24 @@ class MainWindow(QMainWindow):
             self, "Select Video File", "", "Video Files (*.mp4 *.avi *.mov *.mkv)")
         
         if file_path:
-            self.input_video_path = file_path
-            self.input_path_label.setText(os.path.basename(file_path))
+            self._input_p = Path(file_path)
+            self.input_video_path = str(self._input_p)
+            self.input_path_label.setText(self._input_p.name)
             
-            base_name = os.path.splitext(file_path)[0]
-            self.output_video_path = f"{base_name}_subtitled.mp4"
-            self.output_path_label.setText(os.path.basename(self.output_video_path))
+            output_p = self._input_p.with_name(self._input_p.stem + "_subtitled.mp4")
+            self.output_video_path = str(output_p)
+            self.output_path_label.setText(output_p.name)
             
             self.video_player.load_video(file_path)
             
-            self.status_bar.showMessage(f"Loaded: {os.path.basename(file_path)}")
+            self.status_bar.showMessage(f"Loaded: {self._input_p.name}")
     
     def select_output_location(self):
         if not self.input_video_path:
             QMessageBox.warning(self, "Warning", "Please select an input video first.")
             return
         
-        suggested_name = os.path.splitext(os.path.basename(self.input_video_path))[0] + "_subtitled.mp4"
+        suggested_name = self._input_p.stem + "_subtitled.mp4"
         
         file_path, _ = QFileDialog.getSaveFileName(
             self, "Save Output Video", suggested_name, "MP4 Video (*.mp4)")
@@ -665,6 +953,14 @@ class MainWindow(QMainWindow):
             self.model_path = dir_path
             self.model_path_label.setText(os.path.basename(dir_path))
     
+    def unload_model(self):
+        if not self.extract_subtitles_btn.isEnabled():
+            QMessageBox.warning(self, "Warning", "Cannot unload the model while subtitles are being extracted.")
+            return
+        
+        subtitling_backend.release_models()
+        self.status_bar.showMessage("Speech recognition models unloaded")
+    
     def extract_subtitles(self):
         if not self.input_video_path:
             QMessageBox.warning(self, "Warning", "Please select an input video first.")
@@ -677,25 +973,43 @@ class MainWindow(QMainWindow):
         self.generate_video_btn.setEnabled(False)
         self.export_srt_btn.setEnabled(False)
         
-        self.worker = SubtitleWorker(
+        job = SubtitleRunnable(
             self.input_video_path, 
             self.output_video_path, 
             self.model_path, 
             self.style_settings.get_settings()
         )
         
-        self.worker.progress_update.connect(self.update_progress)
-        self.worker.finished.connect(self.extraction_finished)
-        self.worker.subtitles_extracted.connect(self.set_subtitles)
+        job.signals.progress_update.connect(self.update_progress)
+        job.signals.finished.connect(self.extraction_finished)
+        job.signals.subtitles_extracted.connect(self.set_subtitles)
         
-        self.worker.start()
+        self._start_job(job)
+    
+    def _start_job(self, job):
+        signals = job.signals
+        self._active_jobs.add(signals)
+        self.extract_action.setEnabled(False)
+        signals.finished.connect(lambda *args: self._job_finished(signals))
+        self.pool.start(job)
+    
+    def _job_finished(self, signals):
+        self._active_jobs.discard(signals)
+        self.extract_action.setEnabled(not self._active_jobs)
     
     def set_subtitles(self, subtitles):
         self.subtitles = subtitles
+        self._subtitles_stale = False
         self.subtitle_editor.load_subtitles(self.subtitles)
     
     def on_subtitle_updated(self):
-        self.subtitles = self.subtitle_editor.get_subtitles()
+        self._subtitles_stale = True
+    
+    def _current_subtitles(self):
+        if self._subtitles_stale:
+            self.subtitles = self.subtitle_editor.get_subtitles()
+            self._subtitles_stale = False
+        return self.subtitles
     
     def update_progress(self, status, progress):
         self.status_label.setText(status)
@@ -721,7 +1035,7 @@ class MainWindow(QMainWindow):
         self.status_bar.showMessage("Ready")
     
     def generate_video(self):
-        if not self.subtitles:
+        if not self._current_subtitles():
             QMessageBox.warning(self, "Warning", "No subtitles available. Please extract subtitles first.")
             return
         
@@ -736,26 +1050,28 @@ class MainWindow(QMainWindow):
         self.generate_video_btn.setEnabled(False)
         self.export_srt_btn.setEnabled(False)
         
-        updated_subtitles = self.subtitle_editor.get_subtitles()
+        updated_subtitles = self.subtitles
         
-        self.video_worker = VideoGenerationWorker(
+        self.video_player.release_file(self.output_video_path)
+        
+        job = VideoGenerationRunnable(
             self.input_video_path,
             self.output_video_path,
             updated_subtitles,
             self.style_settings.get_settings()
         )
         
-        self.video_worker.progress_update.connect(self.update_progress)
-        self.video_worker.finished.connect(self.generation_finished)
+        job.signals.progress_update.connect(self.update_progress)
+        job.signals.finished.connect(self.generation_finished)
         
-        self.video_worker.start()
+        self._start_job(job)
     
     def generation_finished(self, success, message, output_path):
         if success:
             self.status_label.setText("Video generation complete")
             self.progress_bar.setValue(100)
             
-            QTimer.singleShot(500, lambda: self.video_player.load_video(output_path))
+            self.video_player.load_video_from_memory(output_path)
             
             QMessageBox.information(self, "Success", 
                 f"Subtitled video has been created at:\n{output_path}")
@@ -773,12 +1089,12 @@ class MainWindow(QMainWindow):
         self.status_bar.showMessage("Ready")
     
     def export_srt(self):
-        if not self.subtitles:
+        if not self._current_subtitles():
             QMessageBox.warning(self, "Warning", "No subtitles available. Please extract subtitles first.")
             return
         
         if self.input_video_path:
-            suggested_name = os.path.splitext(os.path.basename(self.input_video_path))[0] + ".srt"
+            suggested_name = self._input_p.stem + ".srt"
         else:
             suggested_name = "subtitles.srt"
         
@@ -789,33 +1105,101 @@ class MainWindow(QMainWindow):
             return
         
         try:
-            updated_subtitles = self.subtitle_editor.get_subtitles()
-            
-            with open(file_path, 'w', encoding='utf-8') as f:
-                for i, subtitle in enumerate(updated_subtitles, 1):
-                    start_time = subtitle["start_time"]
-                    end_time = subtitle["end_time"]
-                    text = subtitle["text"]
-                    
-                    start_str = self._seconds_to_srt_time(start_time)
-                    end_str = self._seconds_to_srt_time(end_time)
-                    
-                    f.write(f"{i}\n")
-                    f.write(f"{start_str} --> {end_str}\n")
-                    f.write(f"{text}\n\n")
+            _write_srt(file_path, self.subtitles)
             
             QMessageBox.information(self, "Success", f"Subtitles exported to {file_path}")
             
         except Exception as e:
             QMessageBox.warning(self, "Error", f"Failed to export SRT: {str(e)}")
     
-    def _seconds_to_srt_time(self, seconds):
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
-        millisecs = int((seconds - int(seconds)) * 1000)
+    def batch_export_srt(self):
+        file_paths, _ = QFileDialog.getOpenFileNames(
+            self, "Select Video Files", "", "Video Files (*.mp4 *.avi *.mov *.mkv)")
+        
+        if not file_paths:
+            return
+        
+        output_dir = QFileDialog.getExistingDirectory(
+            self, "Select Output Folder for SRT Files", os.path.dirname(file_paths[0]))
+        
+        if not output_dir:
+            return
+        
+        jobs = []
+        used_names = set()
+        for file_path in file_paths:
+            stem = Path(file_path).stem
+            name = stem + ".srt"
+            suffix = 2
+            while name.lower() in used_names:
+                name = f"{stem}_{suffix}.srt"
+                suffix += 1
+            used_names.add(name.lower())
+            jobs.append((file_path, os.path.join(output_dir, name)))
+        existing = {srt_path for _, srt_path in jobs if os.path.exists(srt_path)}
+        
+        if existing:
+            reply = QMessageBox.question(
+                self, "Overwrite SRT Files",
+                f"{len(existing)} SRT file(s) already exist in the selected folder.\n"
+                "Overwrite them? Choose No to skip those videos.",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+                | QMessageBox.StandardButton.Cancel
+            )
+            if reply == QMessageBox.StandardButton.Cancel:
+                return
+            if reply == QMessageBox.StandardButton.No:
+                jobs = [job for job in jobs if job[1] not in existing]
         
-        return f"{hours:02d}:{minutes:02d}:{secs:02d},{millisecs:03d}"
+        if not jobs:
+            self.status_bar.showMessage("Batch transcription: no files to export")
+            return
+        
+        for file_path, srt_path in jobs:
+            self._submit_extract(file_path, srt_path)
+        
+        self._batch_pending += len(jobs)
+        self.status_bar.showMessage(f"Batch transcription: {self._batch_pending} file(s) pending")
+    
+    def _submit_extract(self, path, srt_path):
+        if self._batch_executor is None:
+            self._batch_executor = ProcessPoolExecutor(
+                max_workers=min(4, os.cpu_count() or 1),
+                mp_context=multiprocessing.get_context("spawn"))
+        
+        future = self._batch_executor.submit(_extract_worker, (path, self.model_path))
+        future.add_done_callback(partial(self._on_batch_done, path, srt_path))
+        return future
+    
+    def _on_batch_done(self, path, srt_path, future):
+        try:
+            subtitles = future.result()
+            error = "" if subtitles else "No speech detected or transcription failed"
+        except Exception as e:
+            subtitles = None
+            error = str(e)
+        self.batch_extracted.emit(path, srt_path, subtitles, error)
+    
+    def batch_item_finished(self, path, srt_path, subtitles, error):
+        self._batch_pending -= 1
+        name = os.path.basename(path)
+        
+        if subtitles:
+            try:
+                _write_srt(srt_path, subtitles)
+                message = f"Exported {os.path.basename(srt_path)}"
+            except Exception as e:
+                message = f"Failed to export SRT for {name}: {str(e)}"
+        else:
+            message = f"Failed to transcribe {name}: {error}"
+        
+        self.status_bar.showMessage(f"{message} ({self._batch_pending} file(s) pending)")
+    
+    def closeEvent(self, event):
+        if self._batch_executor is not None:
+            self._batch_executor.shutdown(wait=False, cancel_futures=True)
+        subtitling_backend.release_models()
+        super().closeEvent(event)
     
     def show_about(self):
         QMessageBox.about(self, "About Video Subtitler",
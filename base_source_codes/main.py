@@ -1,66 +1,289 @@
 import argparse
 import os
 import time
+import gc
 import json
 import subprocess
+import queue
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
 import cv2
 import numpy as np
 import vosk
-import wave
 import ffmpeg
 from tqdm import tqdm
 
-def extract_audio(video_path, audio_path="temp_audio.wav"):
-    print(f"Extracting audio from {video_path}...")
-    
+try:
+    from numba import njit
+    _HAVE_NUMBA = True
+except ImportError:
+    _HAVE_NUMBA = False
+    
+    def njit(*args, **kwargs):
+        return lambda fn: fn
+
+AUDIO_SAMPLE_RATE = 16000
+AUDIO_CHUNK_BYTES = 8000
+PCM_CHUNK_BYTES = 32000
+TRANSCRIBE_CHUNK_SECONDS = 30
+TRANSCRIBE_OVERLAP_SECONDS = 2
+TRANSCRIBE_THREADS_PER_JOB = 2
+LOW_LATENCY_INPUT_ARGS = {"probesize": 32, "analyzeduration": 0, "fflags": "nobuffer"}
+HARDWARE_VIDEO_ENCODERS = ("h264_nvenc", "h264_videotoolbox")
+FRAME_PIPE_BUFSIZE = 1 << 20
+FRAME_QUEUE_SIZE = 16
+DEFAULT_MODEL_NAME = "vosk-model-small-en-us-0.15"
+MODEL_CACHE_SIZE = 2
+SUBTITLE_FONT = cv2.FONT_HERSHEY_DUPLEX
+SUBTITLE_FONT_SCALE = 0.7
+SUBTITLE_THICKNESS = 1
+SUBTITLE_OUTLINE_THICKNESS = SUBTITLE_THICKNESS + 2
+SUBTITLE_LINE_HEIGHT = 30
+SUBTITLE_BG_PADDING = 10
+SUBTITLE_BG_ALPHA = 0.6
+SUBTITLE_TEXT_COLOR = (255, 255, 255)
+SUBTITLE_OUTLINE_COLOR = (0, 0, 0)
+SUBTITLE_BG_COLOR = (0, 0, 0)
+
+_MODEL_CACHE = {}
+_EXECUTOR_CACHE = {}
+
+def stream_pcm(video_path, chunk_bytes=PCM_CHUNK_BYTES):
+    process = (
+        ffmpeg
+        .input(video_path)
+        .output('pipe:', format='s16le', acodec='pcm_s16le', ac=1, ar=str(AUDIO_SAMPLE_RATE))
+        .global_args('-loglevel', 'error')
+        .run_async(pipe_stdout=True)
+    )
     try:
-        (
-            ffmpeg
-            .input(video_path)
-            .output(audio_path, acodec='pcm_s16le', ac=1, ar='16000')
-            .run(quiet=True, overwrite_output=True)
-        )
-        print("Audio extraction complete")
-        return audio_path
+        yield from iter(lambda: process.stdout.read(chunk_bytes), b'')
+    finally:
+        process.stdout.close()
+        returncode = process.wait()
+    if returncode != 0:
+        raise RuntimeError(f"Error extracting audio: ffmpeg exited with code {returncode}")
+
+def stream_audio(video_path, audio_queue, chunk_bytes=AUDIO_CHUNK_BYTES, stop_event=None):
+    pcm_chunks = stream_pcm(video_path, chunk_bytes)
+    try:
+        for data in pcm_chunks:
+            if stop_event is not None and stop_event.is_set():
+                break
+            audio_queue.put(data)
     except Exception as e:
-        print(f"Error extracting audio: {e}")
-        return None
+        print(f"Error streaming audio: {e}")
+        audio_queue.put(e)
+    finally:
+        pcm_chunks.close()
+        audio_queue.put(None)
 
-def transcribe_audio(audio_path, model_path=None):
-    print("Transcribing audio...")
+def _queued_chunks(audio_queue):
+    for data in iter(audio_queue.get, None):
+        if isinstance(data, Exception):
+            raise data
+        yield data
+
+def get_audio_byte_count(video_path):
+    try:
+        duration = float(ffmpeg.probe(video_path)["format"]["duration"])
+    except Exception:
+        return 0
+    return int(duration * AUDIO_SAMPLE_RATE) * 2
+
+def _resolve_model_path(model_path):
+    if not model_path and os.path.exists("model"):
+        return "model"
+    return model_path or None
+
+class _ModelLocator(vosk.Model):
+    def __init__(self):
+        pass
+    
+    def __del__(self):
+        pass
+
+@lru_cache(maxsize=1)
+def _default_model_dir():
+    try:
+        return _ModelLocator().get_model_path(DEFAULT_MODEL_NAME, None)
+    except SystemExit:
+        raise RuntimeError(f"Vosk model '{DEFAULT_MODEL_NAME}' is not available")
+
+def _model_dir(model_path):
+    path = _resolve_model_path(model_path)
+    if not path:
+        print("No model specified. Using small model...")
+        path = _default_model_dir()
+    if not os.path.isdir(path):
+        raise FileNotFoundError(f"Vosk model directory not found: {path}")
+    return path
+
+def _get_model(path):
+    model = _MODEL_CACHE.pop(path, None)
+    if model is None:
+        model = vosk.Model(path)
+    _MODEL_CACHE[path] = model
+    while len(_MODEL_CACHE) > MODEL_CACHE_SIZE:
+        _MODEL_CACHE.pop(next(iter(_MODEL_CACHE)))
+    return model
+
+def load_model(model_path=None):
+    return _get_model(_model_dir(model_path))
+
+def get_transcribe_executor(model_path=None, jobs=None):
+    key = (_model_dir(model_path), jobs or default_jobs())
+    executor = _EXECUTOR_CACHE.pop(key, None)
+    if executor is None:
+        executor = ProcessPoolExecutor(max_workers=key[1], initializer=_init_transcribe_worker,
+                                       initargs=(key[0],),
+                                       mp_context=multiprocessing.get_context("spawn"))
+    _EXECUTOR_CACHE[key] = executor
+    while len(_EXECUTOR_CACHE) > MODEL_CACHE_SIZE:
+        _EXECUTOR_CACHE.pop(next(iter(_EXECUTOR_CACHE))).shutdown(wait=False, cancel_futures=True)
+    return executor
+
+def release_model(model_path=None):
+    path = _resolve_model_path(model_path)
+    if path is None:
+        if not _default_model_dir.cache_info().currsize:
+            return
+        path = _default_model_dir()
+    _MODEL_CACHE.pop(path, None)
+    for key in [key for key in _EXECUTOR_CACHE if key[0] == path]:
+        _EXECUTOR_CACHE.pop(key).shutdown(wait=False, cancel_futures=True)
+    gc.collect()
+
+def release_models():
+    _MODEL_CACHE.clear()
+    while _EXECUTOR_CACHE:
+        _EXECUTOR_CACHE.popitem()[1].shutdown(wait=False, cancel_futures=True)
+    gc.collect()
+
+def default_jobs():
+    return max(1, (os.cpu_count() or 1) // TRANSCRIBE_THREADS_PER_JOB)
+
+def split_audio(pcm_chunks, seconds=TRANSCRIBE_CHUNK_SECONDS, overlap=TRANSCRIBE_OVERLAP_SECONDS):
+    bytes_per_second = AUDIO_SAMPLE_RATE * 2
+    step = seconds * bytes_per_second
+    window = step + overlap * bytes_per_second
+    buffer = bytearray()
+    offset = 0
+    
+    for data in pcm_chunks:
+        buffer.extend(data)
+        while len(buffer) >= window:
+            yield offset, bytes(buffer[:window])
+            del buffer[:step]
+            offset += seconds
+    
+    if buffer and (offset == 0 or len(buffer) > overlap * bytes_per_second):
+        yield offset, bytes(buffer)
+
+class ModelLoadError(RuntimeError):
+    pass
+
+_worker_model = None
+_worker_error = None
+
+def _init_transcribe_worker(model_path):
+    global _worker_model, _worker_error
+    try:
+        _worker_model = vosk.Model(model_path)
+    except BaseException as e:
+        _worker_error = ModelLoadError(f"Failed to load Vosk model from {model_path}: {e}")
+
+def transcribe_chunk(pcm, offset):
+    if _worker_error is not None:
+        raise _worker_error
+    
+    rec = vosk.KaldiRecognizer(_worker_model, AUDIO_SAMPLE_RATE)
+    rec.SetWords(True)
     
-    if model_path is None:
-        if os.path.exists("model"):
-            model_path = "model"
+    results = []
+    for start in range(0, len(pcm), AUDIO_CHUNK_BYTES):
+        if rec.AcceptWaveform(pcm[start:start + AUDIO_CHUNK_BYTES]):
+            results.extend(json.loads(rec.Result()).get('result', []))
+    results.extend(json.loads(rec.FinalResult()).get('result', []))
+    
+    for word in results:
+        word["start"] += offset
+        word["end"] += offset
+    return results
+
+def merge_chunk_words(chunk_results, overlap=TRANSCRIBE_OVERLAP_SECONDS):
+    chunk_results = sorted(chunk_results, key=lambda chunk: chunk[0])
+    merged = []
+    
+    for i, (offset, words) in enumerate(chunk_results):
+        lower = offset + overlap / 2 if i > 0 else float("-inf")
+        if i + 1 < len(chunk_results):
+            upper = chunk_results[i + 1][0] + overlap / 2
         else:
-            print("No model specified. Using small model...")
-            from vosk import Model
-            model = Model(model_name="vosk-model-small-en-us-0.15")
-            model_path = model.model_path
+            upper = float("inf")
+        merged.extend(word for word in words if lower <= word["start"] < upper)
     
-    model = vosk.Model(model_path)
+    return merged
+
+def transcribe_chunks(chunks, model_path=None, jobs=None, progress_callback=None):
+    jobs = jobs or default_jobs()
+    in_flight = threading.BoundedSemaphore(jobs * 2)
+    done_lock = threading.Lock()
+    done = [0]
+    futures = []
+    
+    def on_done(future):
+        in_flight.release()
+        with done_lock:
+            done[0] += 1
+            chunks_done = done[0]
+        if progress_callback:
+            progress_callback(chunks_done)
+    
+    model_dir = _model_dir(model_path)
+    executor = get_transcribe_executor(model_dir, jobs)
+    try:
+        for offset, pcm in chunks:
+            in_flight.acquire()
+            future = executor.submit(transcribe_chunk, pcm, offset)
+            future.add_done_callback(on_done)
+            futures.append((offset, future))
+        
+        chunk_results = [(offset, future.result()) for offset, future in futures]
+    except (BrokenProcessPool, ModelLoadError):
+        release_model(model_dir)
+        raise
     
-    wf = wave.open(audio_path, "rb")
+    return merge_chunk_words(chunk_results)
+
+def transcribe_audio_stream(audio_queue, model_path=None, progress_callback=None, jobs=None):
+    print("Transcribing audio stream...")
     
-    if wf.getnchannels() != 1 or wf.getsampwidth() != 2 or wf.getcomptype() != "NONE":
-        print("Audio file must be WAV format mono PCM.")
-        return None
+    chunks = split_audio(_queued_chunks(audio_queue))
+    results = transcribe_chunks(chunks, model_path, jobs, progress_callback)
     
-    rec = vosk.KaldiRecognizer(model, wf.getframerate())
-    rec.SetWords(True)
+    subtitles = convert_to_subtitles(results, AUDIO_SAMPLE_RATE)
     
-    results = []
+    print(f"Transcription complete. Generated {len(subtitles)} subtitle segments.")
+    return subtitles
+
+def _transcribe_pcm(pcm_chunks, total_bytes, model_path=None, jobs=1):
+    if jobs > 1:
+        window_bytes = TRANSCRIBE_CHUNK_SECONDS * AUDIO_SAMPLE_RATE * 2
+        total_windows = max(1, -(-total_bytes // window_bytes))
+        with tqdm(total=total_windows, desc=f"Transcribing ({jobs} jobs)") as pbar:
+            return transcribe_chunks(split_audio(pcm_chunks), model_path, jobs,
+                                     lambda done: pbar.update(1))
     
-    total_frames = wf.getnframes()
-    frames_per_chunk = 4000
-    total_chunks = total_frames // frames_per_chunk
+    results = []
+    rec = vosk.KaldiRecognizer(load_model(model_path), AUDIO_SAMPLE_RATE)
+    rec.SetWords(True)
     
-    for i in tqdm(range(0, total_chunks + 1), desc="Transcribing"):
-        data = wf.readframes(frames_per_chunk)
-        if len(data) == 0:
-            break
-            
-        if rec.AcceptWaveform(data):
+    for pcm in tqdm(pcm_chunks, total=-(-total_bytes // PCM_CHUNK_BYTES) or None, desc="Transcribing"):
+        if rec.AcceptWaveform(pcm):
             result = json.loads(rec.Result())
             if 'result' in result:
                 results.extend(result['result'])
@@ -69,57 +292,131 @@ def transcribe_audio(audio_path, model_path=None):
     if 'result' in final_result:
         results.extend(final_result['result'])
     
-    subtitles = convert_to_subtitles(results, wf.getframerate())
+    return results
+
+def transcribe_video(video_path, model_path=None, jobs=1):
+    print("Transcribing audio...")
+    
+    total_bytes = get_audio_byte_count(video_path)
+    results = _transcribe_pcm(stream_pcm(video_path), total_bytes, model_path, jobs)
+    
+    subtitles = convert_to_subtitles(results, AUDIO_SAMPLE_RATE)
     
-    wf.close()
     print(f"Transcription complete. Generated {len(subtitles)} subtitle segments.")
     return subtitles
 
+@njit(cache=True)
+def _segment_words(word_lens, max_chars):
+    seg_starts = [0]
+    used = 0
+    for i in range(len(word_lens)):
+        length = word_lens[i]
+        if i > 0 and used + length > max_chars:
+            seg_starts.append(i)
+            used = 0
+        used += length + 1
+    return seg_starts
+
 def convert_to_subtitles(word_results, sample_rate, max_chars=60):
     if not word_results:
         return []
     
-    subtitles = []
-    current_subtitle = {
-        "text": "",
-        "words": [],
-        "start_time": word_results[0]["start"],
-        "end_time": word_results[0]["end"]
-    }
-    
-    for word_data in word_results:
-        word = word_data["word"]
-        
-        if len(current_subtitle["text"] + word) > max_chars:
-            subtitles.append(current_subtitle)
-            current_subtitle = {
-                "text": word + " ",
-                "words": [word_data],
-                "start_time": word_data["start"],
-                "end_time": word_data["end"]
-            }
-        else:
-            current_subtitle["text"] += word + " "
-            current_subtitle["words"].append(word_data)
-            current_subtitle["end_time"] = word_data["end"]
-    
-    if current_subtitle["text"]:
-        subtitles.append(current_subtitle)
+    word_lens = [len(w["word"]) for w in word_results]
+    if _HAVE_NUMBA:
+        word_lens = np.array(word_lens, dtype=np.int32)
+    bounds = list(_segment_words(word_lens, max_chars))
+    bounds.append(len(word_results))
     
-    for sub in subtitles:
-        sub["text"] = sub["text"].strip()
-        if sub["text"]:
-            sub["text"] = sub["text"][0].upper() + sub["text"][1:]
-        if sub["text"] and sub["text"][-1] not in ".!?":
-            sub["text"] += "."
+    subtitles = []
+    for a, b in zip(bounds, bounds[1:]):
+        words = word_results[a:b]
+        text = " ".join(w["word"] for w in words).strip()
+        if text:
+            text = text[0].upper() + text[1:]
+        if text and text[-1] not in ".!?":
+            text += "."
+        subtitles.append({
+            "text": text,
+            "words": words,
+            "start_time": words[0]["start"],
+            "end_time": words[-1]["end"]
+        })
     
     return subtitles
 
-def create_subtitled_video(video_path, subtitles, output_path):
+@lru_cache(maxsize=1)
+def _select_video_encoder():
+    for encoder in HARDWARE_VIDEO_ENCODERS:
+        try:
+            (
+                ffmpeg
+                .input('color=black:s=256x256:d=0.1', f='lavfi')
+                .output('-', f='null', vcodec=encoder)
+                .run(quiet=True)
+            )
+            return encoder
+        except Exception:
+            continue
+    return 'libx264'
+
+def _has_audio(video_path):
+    try:
+        streams = ffmpeg.probe(video_path)["streams"]
+    except Exception:
+        return False
+    return any(stream.get("codec_type") == "audio" for stream in streams)
+
+def _frame_to_subtitle(subtitles, fps, total_frames):
+    starts = np.fromiter((s["start_time"] for s in subtitles), np.float64, count=len(subtitles))
+    ends = np.fromiter((s["end_time"] for s in subtitles), np.float64, count=len(subtitles))
+    starts_f = np.ceil(starts * fps).astype(np.int64).clip(0)
+    ends_f = np.ceil(ends * fps).astype(np.int64).clip(0)
+    
+    frame_to_sub = np.full(max(total_frames, int(ends_f.max(initial=0))), -1, dtype=np.int32)
+    for i, (first, stop) in enumerate(zip(starts_f.tolist(), ends_f.tolist())):
+        frame_to_sub[first:stop] = i
+    return frame_to_sub
+
+def _decode_frames(cap, frame_q, stop_event, errors):
+    try:
+        while not stop_event.is_set():
+            ret, frame = cap.read()
+            if not ret:
+                break
+            frame_q.put(frame)
+    except Exception as e:
+        errors.append(e)
+    finally:
+        frame_q.put(None)
+
+def _draw_frames(frame_q, drawn_q, subtitles, frame_to_sub, stop_event, errors):
+    last_frame = len(frame_to_sub)
+    frame_idx = 0
+    try:
+        while True:
+            frame = frame_q.get()
+            if frame is None:
+                break
+            if stop_event.is_set():
+                continue
+            
+            sidx = frame_to_sub[frame_idx] if frame_idx < last_frame else -1
+            if sidx >= 0:
+                frame = add_subtitle_to_frame(frame, subtitles[sidx]["text"])
+            
+            drawn_q.put(frame)
+            frame_idx += 1
+    except Exception as e:
+        errors.append(e)
+        stop_event.set()
+        while frame_q.get() is not None:
+            pass
+    finally:
+        drawn_q.put(None)
+
+def create_subtitled_video(video_path, subtitles, output_path, low_latency=False):
     print("Adding subtitles to video...")
     
-    temp_video_path = "temp_subtitled_video.mp4"
-    
     cap = cv2.VideoCapture(video_path)
     
     width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
@@ -127,161 +424,208 @@ def create_subtitled_video(video_path, subtitles, output_path):
     fps = cap.get(cv2.CAP_PROP_FPS)
     total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
     
-    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-    out = cv2.VideoWriter(temp_video_path, fourcc, fps, (width, height))
-    
-    frame_idx = 0
-    subtitle_idx = 0
-    active_subtitle = None
-    
-    with tqdm(total=total_frames, desc="Processing frames") as pbar:
-        while cap.isOpened():
-            ret, frame = cap.read()
-            if not ret:
-                break
-            
-            current_time = frame_idx / fps
-            
-            while subtitle_idx < len(subtitles) and current_time >= subtitles[subtitle_idx]["end_time"]:
-                subtitle_idx += 1
-            
-            if subtitle_idx < len(subtitles) and current_time >= subtitles[subtitle_idx]["start_time"]:
-                active_subtitle = subtitles[subtitle_idx]
-            else:
-                active_subtitle = None
-            
-            if active_subtitle:
-                frame = add_subtitle_to_frame(frame, active_subtitle["text"])
-            
-            out.write(frame)
-            
-            frame_idx += 1
-            pbar.update(1)
-    
-    cap.release()
-    out.release()
-    
-    print("Merging video with original audio...")
+    frame_to_sub = _frame_to_subtitle(subtitles, fps, total_frames)
+    
+    encoder = _select_video_encoder()
+    output_args = {'vcodec': encoder, 'pix_fmt': 'yuv420p'}
+    if encoder == 'libx264':
+        output_args.update(preset='ultrafast', threads=0)
+        if low_latency:
+            output_args['tune'] = 'zerolatency'
+    if width % 2 or height % 2:
+        output_args['vf'] = 'pad=ceil(iw/2)*2:ceil(ih/2)*2'
+    
+    streams = [ffmpeg.input('pipe:', format='rawvideo', pix_fmt='bgr24', s=f'{width}x{height}', r=fps)]
+    if _has_audio(video_path):
+        input_args = LOW_LATENCY_INPUT_ARGS if low_latency else {}
+        streams.append(ffmpeg.input(video_path, **input_args).audio)
+        output_args['acodec'] = 'aac'
+    
+    args = (
+        ffmpeg
+        .output(*streams, output_path, **output_args)
+        .global_args('-loglevel', 'error')
+        .overwrite_output()
+        .compile()
+    )
+    process = subprocess.Popen(args, stdin=subprocess.PIPE, bufsize=FRAME_PIPE_BUFSIZE)
+    
+    frame_q = queue.Queue(maxsize=FRAME_QUEUE_SIZE)
+    drawn_q = queue.Queue(maxsize=FRAME_QUEUE_SIZE)
+    stop_event = threading.Event()
+    errors = []
+    stages = [
+        threading.Thread(target=_decode_frames, args=(cap, frame_q, stop_event, errors), daemon=True),
+        threading.Thread(target=_draw_frames, args=(frame_q, drawn_q, subtitles, frame_to_sub, stop_event, errors), daemon=True),
+    ]
+    for stage in stages:
+        stage.start()
     
     try:
-        input_video = ffmpeg.input(temp_video_path)
-        input_audio = ffmpeg.input(video_path).audio
-        
-        ffmpeg.output(
-            input_video, 
-            input_audio, 
-            output_path, 
-            vcodec='copy',
-            acodec='aac'
-        ).run(quiet=True, overwrite_output=True)
-        
-        if os.path.exists(temp_video_path):
-            os.remove(temp_video_path)
-        
-        print(f"Video with subtitles and audio saved to {output_path}")
-        return output_path
-        
-    except Exception as e:
-        print(f"Error merging audio: {e}")
-        
-        if os.path.exists(temp_video_path):
-            print("Returning video without audio")
-            os.rename(temp_video_path, output_path)
-            return output_path
+        with tqdm(total=total_frames, desc=f"Processing frames ({encoder})") as pbar:
+            while True:
+                frame = drawn_q.get()
+                if frame is None:
+                    break
+                process.stdin.write(frame.data)
+                pbar.update(1)
+    except BrokenPipeError:
+        print("FFmpeg stopped accepting frames")
+        stop_event.set()
+        while drawn_q.get() is not None:
+            pass
+    except BaseException:
+        stop_event.set()
+        while drawn_q.get() is not None:
+            pass
+        raise
+    finally:
+        for stage in stages:
+            stage.join()
+        cap.release()
+        try:
+            process.stdin.close()
+        except BrokenPipeError:
+            pass
+        returncode = process.wait()
+    
+    if errors:
+        print(f"Error adding subtitles to video: {errors[0]}")
         return None
-
-def add_subtitle_to_frame(frame, text):
-    height, width = frame.shape[:2]
     
-    font = cv2.FONT_HERSHEY_DUPLEX
-    font_scale = 0.7
-    thickness = 1
-    text_color = (255, 255, 255)
-    outline_color = (0, 0, 0)
-    
-    max_width = width - 100
-    lines = wrap_text(text, font, font_scale, thickness, max_width)
+    if returncode != 0:
+        print(f"Error encoding video: ffmpeg exited with code {returncode}")
+        return None
     
-    line_height = 30
-    total_height = len(lines) * line_height
+    print(f"Video with subtitles and audio saved to {output_path}")
+    return output_path
+
+@lru_cache(maxsize=4096)
+def _text_size(text, font, font_scale, thickness):
+    return cv2.getTextSize(text, font, font_scale, thickness)[0]
+
+@lru_cache(maxsize=512)
+def _layout_subtitle(text, width, height):
+    lines = wrap_text(text, SUBTITLE_FONT, SUBTITLE_FONT_SCALE, SUBTITLE_THICKNESS, width - 100)
     
+    total_height = len(lines) * SUBTITLE_LINE_HEIGHT
     y_position = height - 50 - total_height
     
+    layout = []
     for i, line in enumerate(lines):
-        y = y_position + i * line_height
-        
-        (text_width, text_height), _ = cv2.getTextSize(line, font, font_scale, thickness)
-        
+        y = y_position + i * SUBTITLE_LINE_HEIGHT
+        text_width, text_height = _text_size(line, SUBTITLE_FONT, SUBTITLE_FONT_SCALE, SUBTITLE_THICKNESS)
         x = (width - text_width) // 2
-        
-        bg_padding = 10
-        overlay = frame.copy()
+        layout.append((line, x, y, text_width, text_height))
+    
+    return tuple(layout)
+
+@lru_cache(maxsize=8)
+def _subtitle_overlay(text, width, height):
+    layout = _layout_subtitle(text, width, height)
+    if not layout:
+        return None
+    
+    pad = SUBTITLE_BG_PADDING
+    x0 = max(min(x for _, x, _, _, _ in layout) - pad, 0)
+    x1 = min(max(x + text_width for _, x, _, text_width, _ in layout) + pad, width)
+    y0 = max(min(y - text_height for _, _, y, _, text_height in layout) - pad, 0)
+    y1 = min(max(y for _, _, y, _, _ in layout) + pad, height)
+    if x0 >= x1 or y0 >= y1:
+        return None
+    
+    size = (y1 - y0, x1 - x0)
+    bg_mask = np.zeros(size, dtype=np.uint8)
+    outline_mask = np.zeros(size, dtype=np.uint8)
+    fill_mask = np.zeros(size, dtype=np.uint8)
+    
+    for line, x, y, text_width, text_height in layout:
         cv2.rectangle(
-            overlay, 
-            (x - bg_padding, y - text_height - bg_padding),
-            (x + text_width + bg_padding, y + bg_padding),
-            (0, 0, 0), 
+            bg_mask,
+            (x - pad - x0, y - text_height - pad - y0),
+            (x + text_width + pad - x0, y + pad - y0),
+            255,
             -1
         )
-        alpha = 0.6
-        cv2.addWeighted(overlay, alpha, frame, 1 - alpha, 0, frame)
-        
-        for dx, dy in [(-1, -1), (-1, 1), (1, -1), (1, 1)]:
-            cv2.putText(frame, line, (x + dx, y + dy), font, font_scale, outline_color, thickness, cv2.LINE_AA)
-        
-        cv2.putText(frame, line, (x, y), font, font_scale, text_color, thickness, cv2.LINE_AA)
+        org = (x - x0, y - y0)
+        cv2.putText(outline_mask, line, org, SUBTITLE_FONT, SUBTITLE_FONT_SCALE, 255,
+                    SUBTITLE_OUTLINE_THICKNESS, cv2.LINE_AA)
+        cv2.putText(fill_mask, line, org, SUBTITLE_FONT, SUBTITLE_FONT_SCALE, 255,
+                    SUBTITLE_THICKNESS, cv2.LINE_AA)
+    
+    fill_alpha = fill_mask.astype(np.float32) / 255
+    outline_alpha = outline_mask.astype(np.float32) / 255 * (1 - fill_alpha)
+    bg_alpha = bg_mask.astype(np.float32) * (SUBTITLE_BG_ALPHA / 255) * (1 - outline_alpha - fill_alpha)
+    
+    keep = np.rint((1 - fill_alpha - outline_alpha - bg_alpha) * 255).astype(np.uint8)
+    keep = np.ascontiguousarray(np.broadcast_to(keep[..., None], size + (3,)))
+    color = np.rint(
+        np.multiply.outer(fill_alpha, SUBTITLE_TEXT_COLOR)
+        + np.multiply.outer(outline_alpha, SUBTITLE_OUTLINE_COLOR)
+        + np.multiply.outer(bg_alpha, SUBTITLE_BG_COLOR)
+    ).astype(np.uint8)
+    
+    return y0, x0, keep, color
+
+def add_subtitle_to_frame(frame, text):
+    height, width = frame.shape[:2]
+    
+    overlay = _subtitle_overlay(text, width, height)
+    if overlay is None:
+        return frame
+    
+    y0, x0, keep, color = overlay
+    roi = frame[y0:y0 + keep.shape[0], x0:x0 + keep.shape[1]]
+    cv2.multiply(roi, keep, roi, scale=1 / 255)
+    cv2.add(roi, color, roi)
     
     return frame
 
+@lru_cache(maxsize=8)
+def _glyph_advances(font, font_scale):
+    probe = 100
+    advances = np.empty(256, dtype=np.float64)
+    for byte in range(256):
+        glyph = chr(byte) if 32 <= byte < 127 else "?"
+        width = cv2.getTextSize(glyph * probe, font, font_scale, 1)[0][0]
+        advances[byte] = round((width - 1) / (probe * font_scale)) * font_scale
+    return advances
+
 def wrap_text(text, font, font_scale, thickness, max_width):
     words = text.split()
     if not words:
         return []
-        
-    lines = []
-    current_line = []
     
-    for word in words:
-        test_line = current_line + [word]
-        test_text = ' '.join(test_line)
-        
-        (text_width, _), _ = cv2.getTextSize(test_text, font, font_scale, thickness)
-        
-        if text_width <= max_width:
-            current_line = test_line
-        else:
-            if current_line:
-                lines.append(' '.join(current_line))
-            current_line = [word]
+    encoded = [word.encode("utf-8") for word in words]
+    data = np.frombuffer(b" ".join(encoded), dtype=np.uint8)
+    cum = np.concatenate(([0.0], np.cumsum(_glyph_advances(font, font_scale)[data])))
     
-    if current_line:
-        lines.append(' '.join(current_line))
+    word_lens = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+    word_ends = np.cumsum(word_lens + 1) - 1
+    word_starts = word_ends - word_lens
+    end_widths = cum[word_ends]
+    start_widths = cum[word_starts]
+    limit = max_width - thickness + 0.5
+    
+    lines = []
+    i = 0
+    while i < len(words):
+        j = int(np.searchsorted(end_widths, start_widths[i] + limit, side='right'))
+        if j > i and np.rint(end_widths[j - 1] - start_widths[i] + thickness) > max_width:
+            j -= 1
+        j = max(j, i + 1)
+        lines.append(' '.join(words[i:j]))
+        i = j
     
     return lines
 
-def clean_up_temp_files(temp_files):
-    for file_path in temp_files:
-        if file_path and os.path.exists(file_path):
-            try:
-                os.remove(file_path)
-                print(f"Removed temporary file: {file_path}")
-            except Exception as e:
-                print(f"Failed to remove temporary file {file_path}: {e}")
-                
-    for temp_file in ["temp_subtitled_video.mp4", "temp_audio.wav"]:
-        if os.path.exists(temp_file):
-            try:
-                os.remove(temp_file)
-                print(f"Removed temporary file: {temp_file}")
-            except Exception as e:
-                print(f"Failed to remove temporary file {temp_file}: {e}")
-
 def main():
     parser = argparse.ArgumentParser(description="Generate subtitles for a video")
     parser.add_argument("input", help="Path to input video file")
     parser.add_argument("-o", "--output", help="Path to output video file (default: input_subtitled.mp4)")
     parser.add_argument("-m", "--model", help="Path to Vosk model directory")
-    parser.add_argument("--keep-temp", action="store_true", help="Keep temporary files")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="Number of parallel transcription processes (default: 1)")
     args = parser.parse_args()
     
     if not os.path.exists(args.input):
@@ -296,17 +640,9 @@ def main():
     print(f"Output will be saved to: {args.output}")
     
     start_time = time.time()
-    temp_files = []
     
     try:
-        audio_path = extract_audio(args.input)
-        temp_files.append(audio_path)
-        
-        if not audio_path:
-            print("Failed to extract audio. Exiting.")
-            return
-        
-        subtitles = transcribe_audio(audio_path, args.model)
+        subtitles = transcribe_video(args.input, args.model, jobs=args.jobs)
         
         if not subtitles:
             print("No speech detected or transcription failed. Exiting.")
@@ -325,11 +661,6 @@ def main():
         
     except Exception as e:
         print(f"An error occurred: {e}")
-    finally:
-        if not args.keep_temp:
-            clean_up_temp_files(temp_files)
-        else:
-            print("Temporary files were kept as requested")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file